@@ -81,6 +81,17 @@ class ContentCuratorApp(App):
         """
         self.push_screen(MainScreen())
 
+    async def on_unmount(self) -> None:
+        """
+        Invoked when the application shuts down. Closes the HTTP session of the
+        content service and the database connections held by the storages.
+
+        :return: None
+        """
+        await self.content_service.close()
+        self.markdown_storage.close()
+        self.item_storage.close()
+
     def get_system_commands(self, screen: Screen) -> Iterable[SystemCommand]:
         """Add custom system commands to the command palette."""
         # Get the default system commands first
@@ -0,0 +1,106 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from textual import log
+
+
+@dataclass
+class CircuitState:
+    """Tracks recent failures for a single key of the circuit breaker"""
+
+    failures: int = 0
+    first_failure_at: Optional[float] = None
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Short-circuits calls to a key (typically a host) that keeps failing.
+
+    After `failure_threshold` consecutive failures within `window` seconds the
+    circuit for that key opens and `allow_request` returns False, so callers can
+    fail fast without doing any network work. Once `cooldown` seconds have passed,
+    a single probe request is let through (half-open state): if it succeeds the
+    circuit closes again, if it fails the circuit stays open for another cooldown.
+    """
+
+    failure_threshold: int = 5
+    window: float = 60.0
+    cooldown: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    states: Dict[str, CircuitState] = field(default_factory=dict)
+
+    def is_open(self, key: str) -> bool:
+        """Returns whether the circuit for the given key is currently open"""
+        state = self.states.get(key)
+        return state is not None and state.opened_at is not None
+
+    def allow_request(self, key: str) -> bool:
+        """
+        Checks whether a request for the given key should be performed.
+
+        :param key: The key identifying the guarded resource, e.g. a host name.
+        :return: True if the circuit is closed, or if it is open but the cooldown
+          has expired and no other probe is in flight; False otherwise.
+        """
+        state = self.states.get(key)
+        if state is None or state.opened_at is None:
+            return True
+        if state.probing or self.clock() - state.opened_at < self.cooldown:
+            return False
+        state.probing = True
+        return True
+
+    def record_success(self, key: str) -> None:
+        """Closes the circuit for the given key and forgets its failures"""
+        if self.states.pop(key, None) is not None:
+            log.info(f"Circuit for {key} closed")
+
+    def release_probe(self, key: str) -> None:
+        """
+        Lets another probe through for the given key when the current one ended
+        without a verdict, e.g. because it was cancelled or failed locally. The
+        circuit stays open, but the next `allow_request` after the cooldown can
+        probe again. Does nothing if no probe is in flight.
+
+        :param key: The key identifying the guarded resource, e.g. a host name.
+        """
+        state = self.states.get(key)
+        if state is not None:
+            state.probing = False
+
+    def record_failure(self, key: str) -> None:
+        """
+        Records a failed request for the given key, opening the circuit when the
+        failure threshold is reached within the time window.
+
+        :param key: The key identifying the guarded resource, e.g. a host name.
+        """
+        now = self.clock()
+        state = self.states.setdefault(key, CircuitState())
+
+        if state.opened_at is not None:
+            if not state.probing:
+                # A request started before the circuit opened: the circuit is
+                # already open, so its failure tells nothing new
+                return
+            # A failed probe keeps the circuit open for another cooldown
+            state.opened_at = now
+            state.probing = False
+            log.warning(f"Probe for {key} failed, circuit stays open")
+            return
+
+        if state.first_failure_at is None or now - state.first_failure_at > self.window:
+            state.failures = 0
+            state.first_failure_at = now
+        state.failures += 1
+
+        if state.failures >= self.failure_threshold:
+            state.opened_at = now
+            log.warning(
+                f"Circuit for {key} opened after {state.failures} failures, "
+                f"skipping requests for {self.cooldown:.0f}s"
+            )
@@ -5,6 +5,13 @@ from typing import Dict, List, Optional
 import yaml
 from yaml.parser import ParserError
 
+try:
+    # libyaml bindings parse an order of magnitude faster than the pure-Python
+    # loader, but they are only available when PyYAML was built against libyaml
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class ConfigError(Exception):
     """
@@ -259,7 +266,7 @@ class AppConfiguration:
 
         try:
             with open(config_path) as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except ParserError as e:
             raise ConfigError(f"Invalid YAML in configuration file: {e}")
         except (
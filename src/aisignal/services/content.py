@@ -1,11 +1,14 @@
 import ast
+import asyncio
 import re
 from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
 
 import aiohttp
 import openai
 from textual import log
 
+from aisignal.core.circuit_breaker import CircuitBreaker
 from aisignal.core.sync_exceptions import (
     APIError,
     ContentAnalysisError,
@@ -48,6 +51,7 @@ class ContentService:
         token_tracker: TokenTracker,
         min_threshold: float,  # New parameter
         max_threshold: float,  # New parameter
+        session: Optional[aiohttp.ClientSession] = None,
     ):
         """
         Initializes the class with the necessary API keys, category list,
@@ -69,6 +73,10 @@ class ContentService:
           The minimum threshold value for a specific operation or configuration.
         :param max_threshold:
           The maximum threshold value for a specific operation or configuration.
+        :param session:
+          An optional aiohttp ClientSession to use for all requests. When given,
+          the caller owns it and `close` leaves it open; otherwise the service
+          creates its own session on first use.
         """
         self.jina_api_key = jina_api_key
         self.openai_client = openai.AsyncOpenAI(api_key=openai_api_key)
@@ -79,6 +87,41 @@ class ContentService:
         self.min_threshold = min_threshold
         self.max_threshold = max_threshold
         self.sync_progress = SyncProgress()
+        self.circuit_breaker = CircuitBreaker()
+        self._session = session
+        self._owns_session = False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the HTTP session shared by all requests of this service, creating
+        it on first use so that it is bound to the running event loop.
+
+        The connector caches DNS lookups and keeps connections alive, so repeated
+        requests to Jina skip name resolution and the TCP/TLS handshake.
+
+        Every fetch goes to the same Jina host and a sync starts all of them at
+        once, so the pool is left unbounded: with a limit, requests waiting for a
+        free connection would count against the timeouts and fail. Only the
+        socket connect is bounded; the total keeps aiohttp's 300s default, as
+        Jina can take a while to render large pages.
+
+        :return: The shared aiohttp ClientSession.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ttl_dns_cache=300, limit=0),
+                timeout=aiohttp.ClientTimeout(total=300, sock_connect=5),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the HTTP session, if it was opened by this service"""
+        if not self._owns_session:
+            return
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def _get_jina_wallet_balance(self) -> Optional[float]:
         """
@@ -92,16 +135,14 @@ class ContentService:
                 f"?api_key={self.jina_api_key}"
             )
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        log.error(
-                            f"Failed to fetch Jina wallet balance: {response.status}"
-                        )
-                        return None
+            session = self._get_session()
+            async with session.get(url) as response:
+                if response.status != 200:
+                    log.error(f"Failed to fetch Jina wallet balance: {response.status}")
+                    return None
 
-                    data = await response.json()
-                    return data.get("wallet", {}).get("total_balance")
+                data = await response.json()
+                return data.get("wallet", {}).get("total_balance")
 
         except Exception as e:
             log.error(f"Error fetching Jina wallet balance: {e}")
@@ -111,6 +152,11 @@ class ContentService:
         """
         Fetch content from URL and compare with stored version.
 
+        Network and API failures are tracked per host by the circuit breaker:
+        once a host has failed repeatedly, further fetches for it fail fast
+        without performing any request until the cooldown expires. Local errors,
+        such as storage failures, are not held against the host.
+
         :param url: The URL to fetch content from.
         :return: A dictionary containing:
             - url: Original URL
@@ -118,7 +164,15 @@ class ContentService:
             - content: Full markdown content
             - diff: ContentDiff object with changes if any
             Returns None if fetch fails.
+        :raises ContentFetchError: If the fetch fails or the circuit for the
+          URL's host is open.
         """
+        host = urlparse(url).netloc
+        if not self.circuit_breaker.allow_request(host):
+            raise ContentFetchError(url, f"too many recent failures for {host}")
+        # Allowed while the circuit is open: this fetch is the half-open probe
+        is_probe = self.circuit_breaker.is_open(host)
+
         try:
             self.sync_progress.start_source(url)
             jina_url = f"https://r.jina.ai/{url}"
@@ -128,43 +182,48 @@ class ContentService:
                 "X-Retain-Images": "none",
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(jina_url, headers=headers) as response:
-                    if response.status != 200:
-                        raise APIError("JinaAI", response.status, response.reason)
-
-                    new_content = await response.text()
-                    estimated_tokens = self.token_tracker.estimate_jina_tokens(
-                        new_content
-                    )
-                    self.token_tracker.add_jina_usage(new_content)
-                    log.info(
-                        f"JinaAI tokens for {url}: "
-                        f"{estimated_tokens:,} tokens "
-                        f"(${(estimated_tokens * 0.02 / 1_000_000):.6f})"
-                    )
+            session = self._get_session()
+            async with session.get(jina_url, headers=headers) as response:
+                if response.status != 200:
+                    raise APIError("JinaAI", response.status, response.reason)
+
+                new_content = await response.text()
+                estimated_tokens = self.token_tracker.estimate_jina_tokens(new_content)
+                self.token_tracker.add_jina_usage(new_content)
+                log.info(
+                    f"JinaAI tokens for {url}: "
+                    f"{estimated_tokens:,} tokens "
+                    f"(${(estimated_tokens * 0.02 / 1_000_000):.6f})"
+                )
 
-                    title = self._extract_title(new_content)
+                title = self._extract_title(new_content)
 
-                    # Get diff from storage
-                    content_diff = self.markdown_storage.get_content_diff(
-                        url, new_content
-                    )
-                    # Store new content if there are changes
+                # Get diff from storage
+                content_diff = self.markdown_storage.get_content_diff(url, new_content)
+                # Store new content if there are changes
 
-                    if content_diff.has_changes:
-                        self.markdown_storage.store_content(url, new_content)
+                if content_diff.has_changes:
+                    self.markdown_storage.store_content(url, new_content)
 
-                    return {
-                        "url": url,
-                        "title": title,
-                        "content": new_content,
-                        "diff": content_diff,
-                    }
+                self.circuit_breaker.record_success(host)
+                return {
+                    "url": url,
+                    "title": title,
+                    "content": new_content,
+                    "diff": content_diff,
+                }
         except aiohttp.ClientError as e:
+            self.circuit_breaker.record_failure(host)
             raise ContentFetchError(url, str(e))
         except Exception as e:
+            if isinstance(e, (APIError, asyncio.TimeoutError)):
+                self.circuit_breaker.record_failure(host)
             raise ContentFetchError(url, f"Unexpected error: {str(e)}")
+        finally:
+            # A probe that ended without a verdict (cancelled, or a local error)
+            # must not keep the host blocked forever
+            if is_probe:
+                self.circuit_breaker.release_probe(host)
 
     # In content.py, add to ContentService class
 
@@ -183,30 +242,28 @@ class ContentService:
                 "X-Retain-Images": "none",  # Don't include images
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(jina_url, headers=headers) as response:
-                    if response.status != 200:
-                        log.error(
-                            "Jina AI error fetching full content: "
-                            f"{response.status} {response.reason}"
-                        )
-                        return None
-
-                    content = await response.text()
-
-                    # Track token usage for this additional API call
-                    estimated_tokens = self.token_tracker.estimate_jina_tokens(content)
-                    self.token_tracker.add_jina_usage(content)
-                    estimated_cost = (
-                        estimated_tokens * COST_PER_MILLION["jina"] / 1_000_000
-                    )
-                    log.info(
-                        f"JinaAI tokens for full content of {url}: "
-                        f"{estimated_tokens:,} tokens "
-                        f"(${estimated_cost:.6f})"
+            session = self._get_session()
+            async with session.get(jina_url, headers=headers) as response:
+                if response.status != 200:
+                    log.error(
+                        "Jina AI error fetching full content: "
+                        f"{response.status} {response.reason}"
                     )
+                    return None
+
+                content = await response.text()
+
+                # Track token usage for this additional API call
+                estimated_tokens = self.token_tracker.estimate_jina_tokens(content)
+                self.token_tracker.add_jina_usage(content)
+                estimated_cost = estimated_tokens * COST_PER_MILLION["jina"] / 1_000_000
+                log.info(
+                    f"JinaAI tokens for full content of {url}: "
+                    f"{estimated_tokens:,} tokens "
+                    f"(${estimated_cost:.6f})"
+                )
 
-                    return content
+                return content
 
         except Exception as e:
             log.error(f"Error fetching full content from {url}: {e}")
@@ -406,11 +463,13 @@ class ContentService:
                     new_items = self.item_storage.filter_new_items(source_url, items)
 
                     if new_items:
-                        self.item_storage.store_items(source_url, new_items)
-                        log.info(f"Stored {len(new_items)} new items for {source_url}")
-                        results[source_url] = self.item_storage.get_stored_items(
-                            source_url
+                        stored_items = self.item_storage.store_items(
+                            source_url, new_items
+                        )
+                        log.info(
+                            f"Stored {len(stored_items)} new items for {source_url}"
                         )
+                        results[source_url] = stored_items
                         # Update completion status
                         self.sync_progress.complete_source(
                             source_url, len(items), len(new_items)
@@ -2,13 +2,43 @@ import difflib
 import hashlib
 import json
 import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from textual import log
 
+# Applied to every new connection: WAL lets readers proceed while a write is in
+# progress, and synchronous=NORMAL only syncs on checkpoints, which is safe in
+# WAL mode and avoids an fsync on every commit. busy_timeout makes SQLite wait
+# for a lock held by another connection (e.g. the token tracker) instead of
+# failing straight away with "database is locked".
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+@lru_cache(maxsize=1024)
+def _decode_categories(categories: str) -> Tuple[str, ...]:
+    """
+    Decodes the JSON list of categories stored with an item. Items share a small
+    set of category combinations, so the decoded values are cached by their JSON
+    text; a tuple is returned so the cached value can't be mutated by callers.
+
+    :param categories: The JSON-encoded list of categories.
+    :return: The categories as a tuple of strings.
+    """
+    return tuple(json.loads(categories))
+
 
 @dataclass
 class ContentDiff:
@@ -28,20 +58,158 @@ class ContentDiff:
     has_changes: bool
 
 
-class MarkdownSourceStorage:
+class BaseStorage(ABC):
     """
-    A class to handle the storage and comparison of markdown content in a
-    SQLite database.
+    Base class for storages backed by a SQLite database. A single connection is
+    opened lazily and kept for the lifetime of the instance, so that every query
+    doesn't pay for opening the database file again.
+
+    Attributes:
+      db_path: The path to the SQLite database file.
     """
 
     def __init__(self, db_path: str = "storage.db"):
         """
-        Initializes an instance of MyClass with a specified database path.
+        Initializes the storage with a database path and makes sure the schema
+        exists. If the database file turns out to be corrupted, it is moved aside
+        and a fresh database is created in its place.
 
         :param db_path: The file path for the database. Defaults to "storage.db".
         """
         self.db_path = Path(db_path)
-        self.init_database()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.init_database()
+        except sqlite3.DatabaseError as e:
+            # SQLite reports "file is not a database" and "database disk image is
+            # malformed" as a plain DatabaseError. Subclasses mean a locked or
+            # unreachable file or a bug in the schema code, not a corruption, so
+            # they surface instead of moving a healthy database aside.
+            if type(e) is not sqlite3.DatabaseError:
+                raise
+            self._quarantine_database(e)
+            self.reopen()
+            self.init_database()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database, opening it on first access.
+
+        The connection can be used as a context manager, which commits the
+        pending transaction on success and rolls it back on error, without
+        closing the connection.
+
+        :return: The open SQLite connection.
+        """
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a new connection to the database and applies the connection
+        pragmas defined in `CONNECTION_PRAGMAS`. Rows are returned as
+        `sqlite3.Row`, which supports both index and column-name access.
+
+        All queries are static SQL with `?` placeholders, so the per-connection
+        statement cache is sized to hold every one of them and they are only
+        prepared once for the lifetime of the connection.
+
+        :return: The newly opened SQLite connection.
+        """
+        conn = sqlite3.connect(self.db_path, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        try:
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+        except BaseException:
+            # Not assigned to the storage yet, so close() couldn't release it;
+            # a pragma fails here e.g. when the file is corrupted
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Runs the enclosed statements in a write transaction. The transaction is
+        opened with `BEGIN IMMEDIATE`, so the write lock is taken upfront (waiting
+        up to the busy timeout) rather than when the first write statement runs,
+        which is where a deferred transaction fails with "database is locked".
+        Commits on success and rolls back on error, including an error raised by
+        the commit itself. Reads don't need this and use plain deferred
+        transactions.
+
+        :return: A cursor on the storage connection.
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+            # Inside the try, so a failed COMMIT (e.g. disk full) is rolled back
+            # too and doesn't leave the long-lived connection in a transaction
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _quarantine_database(self, error: sqlite3.DatabaseError) -> None:
+        """
+        Moves a corrupted database file (and its WAL and shared-memory files, if
+        any) out of the way by renaming it to `<db_path>.corrupt-<timestamp>`, so
+        that the next connection starts from an empty database. The original file
+        is kept for inspection.
+
+        :param error: The error raised while opening the corrupted database.
+        :raises sqlite3.DatabaseError: If the database is not a file on disk, as
+          there is nothing to move aside.
+        """
+        if not self.db_path.is_file():
+            raise error
+        self.close()
+
+        suffix = f".corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        for path in (
+            self.db_path,
+            self.db_path.with_name(f"{self.db_path.name}-wal"),
+            self.db_path.with_name(f"{self.db_path.name}-shm"),
+        ):
+            if path.exists():
+                path.rename(path.with_name(f"{path.name}{suffix}"))
+
+        log.warning(
+            f"Database {self.db_path} is corrupted ({error}), moved it to "
+            f"{self.db_path.name}{suffix} and started with an empty database"
+        )
+
+    def reopen(self) -> sqlite3.Connection:
+        """
+        Closes the current connection, if any, and opens a new one on the same
+        database path, with the connection pragmas applied again. Useful after the
+        database file has been replaced on disk.
+
+        :return: The newly opened SQLite connection.
+        """
+        self.close()
+        return self.conn
+
+    def close(self) -> None:
+        """Closes the connection to the database, if one is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @abstractmethod
+    def init_database(self):
+        """Creates the tables needed by the storage, if they don't exist."""
+
+
+class MarkdownSourceStorage(BaseStorage):
+    """
+    A class to handle the storage and comparison of markdown content in a
+    SQLite database.
+    """
 
     def init_database(self):
         """
@@ -58,7 +226,7 @@ class MarkdownSourceStorage:
 
         :return: None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
 
             # Store markdown sources
@@ -124,7 +292,7 @@ class MarkdownSourceStorage:
         :return: The markdown content stored for the given URL, or None if not found.
         :rtype: str or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT markdown_content FROM sources WHERE url = ?", (url,))
             result = cursor.fetchone()
@@ -141,8 +309,7 @@ class MarkdownSourceStorage:
         """
         content_hash = hashlib.sha256(content.encode()).hexdigest()
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._write_transaction() as cursor:
             cursor.execute(
                 """
                 INSERT OR REPLACE INTO sources 
@@ -167,7 +334,7 @@ class MarkdownSourceStorage:
         return [b.strip() for b in content.split("\n\n") if b.strip()]
 
 
-class ParsedItemStorage:
+class ParsedItemStorage(BaseStorage):
     """
     Class to manage storage of parsed items using SQLite.
 
@@ -175,32 +342,38 @@ class ParsedItemStorage:
       db_path: The path to the SQLite database file.
     """
 
-    def __init__(self, db_path: str = "storage.db"):
-        """
-        Initializes the StorageService class with a database path.
-
-        :param db_path: The path to the database file. Defaults to "storage.db".
-        """
-        self.db_path = Path(db_path)
-        self.init_database()
-
     def init_database(self):
         """
         Initializes the database by creating necessary tables and indexes. If the
         tables already exist, it does not recreate them. This method ensures that
-        the 'items' table and its associated index are available for storing and
+        the 'items' table and its associated indexes are available for storing and
         querying item data.
 
         :raises sqlite3.Error: If an error occurs during the execution of SQL
           commands.
         :return: None
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self.conn as conn:
+            # Add the columns missing from databases created before they existed.
+            # table_info is empty when the table doesn't exist yet, in which case
+            # CREATE TABLE below already includes them.
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(items)")}
+            backfill = "".join(
+                f"ALTER TABLE items ADD COLUMN {definition};\n"
+                for name, definition in (
+                    ("removed", "removed INTEGER NOT NULL DEFAULT 0"),
+                    ("notes", "notes TEXT NOT NULL DEFAULT ''"),
+                )
+                if columns and name not in columns
+            )
 
-            # Store items
-            cursor.execute(
-                """
+            # Create the table, back-fill its columns and create its index in a
+            # single script and transaction
+            conn.executescript(
+                f"""
+                BEGIN;
+
+                -- Store items
                 CREATE TABLE IF NOT EXISTS items (
                     id TEXT PRIMARY KEY,
                     source_url TEXT NOT NULL,
@@ -211,21 +384,24 @@ class ParsedItemStorage:
                     summary TEXT NOT NULL,
                     full_content TEXT NOT NULL,
                     ranking INTEGER NOT NULL DEFAULT 0,
+                    removed INTEGER NOT NULL DEFAULT 0,
+                    notes TEXT NOT NULL DEFAULT '',
                     FOREIGN KEY (source_url) REFERENCES sources(url)
-                )
-            """
-            )
+                );
 
-            # Index for faster source lookups
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_items_source 
-                ON items(source_url)
+                {backfill}
+
+                -- Lets get_stored_items seek by source and removed flag and read
+                -- rows already ordered by first_seen, without a separate sort
+                -- step. It supersedes the former index on source_url alone.
+                DROP INDEX IF EXISTS idx_items_source;
+                CREATE INDEX IF NOT EXISTS idx_items_source_removed_first_seen
+                    ON items(source_url, removed, first_seen DESC);
+
+                COMMIT;
             """
             )
 
-            conn.commit()
-
     def _get_item_identifier(self, item: Dict) -> str:
         """
         Generates a unique identifier for a given item by creating an MD5 hash from
@@ -238,71 +414,101 @@ class ParsedItemStorage:
         """
         return hashlib.md5(f"{item['link']}{item['title']}".encode()).hexdigest()
 
-    def store_items(self, source_url: str, items: List[Dict]):
+    def store_items(self, source_url: str, items: List[Dict]) -> List[Dict]:
         """
-        Stores a list of items into a SQLite database. Each item is checked for
-        existence before insertion to avoid duplicates. Logs informative messages
-        regarding the insertion success or errors encountered during the process.
+        Stores a list of items into a SQLite database. Items already present in
+        the database are skipped, then the new ones are inserted with a single
+        `executemany` call and committed in one transaction. Logs informative
+        messages regarding the insertion success or errors encountered during the
+        process.
 
         :param source_url: The URL from which the items were fetched.
         :type source_url: str
         :param items: A list of dictionaries, each containing details of an item
           such as 'title', 'link', 'categories', 'summary', and 'full_content'.
         :type items: List[Dict]
+        :return: The rows actually inserted, shaped like the dictionaries returned
+          by `get_stored_items`, so callers don't need to query them back.
+        :rtype: List[Dict]
         """
         current_time = datetime.now().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            for item in items:
+        # Build the rows first, keyed by id so duplicates within the batch
+        # are only inserted once
+        rows: Dict[str, Dict] = {}
+        # Categories are encoded here too, so an item that can't be serialized
+        # is skipped like any other invalid item instead of failing the batch
+        encoded_categories: Dict[str, str] = {}
+        for item in items:
+            try:
                 item_id = self._get_item_identifier(item)
-                categories_json = json.dumps(item["categories"])
-
-                try:
-                    # First check if item exists
-                    cursor.execute("SELECT 1 FROM items WHERE id = ?", (item_id,))
-                    if cursor.fetchone():
-                        log.info(f"Item {item_id} already exists, skipping")
-                        continue
-
-                    cursor.execute(
-                        """
-                        INSERT INTO items 
-                        (id, source_url, title, link, first_seen, categories, 
-                        summary, full_content, ranking)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                if item_id in rows:
+                    continue
+                encoded_categories[item_id] = json.dumps(item["categories"])
+                rows[item_id] = {
+                    "id": item_id,
+                    "source_url": source_url,
+                    "title": item["title"],
+                    "link": item["link"],
+                    "first_seen": current_time,
+                    "categories": item["categories"],
+                    "summary": item.get("summary", ""),
+                    "full_content": item.get("full_content", ""),
+                    "ranking": item["ranking"],
+                    "removed": 0,
+                    "notes": "",
+                }
+            except Exception as e:
+                # Log a short reference only: the item may carry a full page
+                name = item.get("link") or item.get("title")
+                log.error(f"Skipping invalid item {name!r}: {e!r}")
+
+        if not rows:
+            return []
+
+        try:
+            with self._write_transaction() as cursor:
+                # Bind the ids as a single JSON array, so the statement text is
+                # the same for every batch size and stays in the statement cache
+                cursor.execute(
+                    "SELECT id FROM items WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(rows)),),
+                )
+                existing_ids = {row[0] for row in cursor.fetchall()}
+                for item_id in existing_ids:
+                    log.info(f"Item {item_id} already exists, skipping")
+
+                stored_items = [
+                    row for item_id, row in rows.items() if item_id not in existing_ids
+                ]
+                cursor.executemany(
+                    """
+                    INSERT INTO items 
+                    (id, source_url, title, link, first_seen, categories, 
+                    summary, full_content, ranking)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
                         (
-                            item_id,
-                            source_url,
-                            item["title"],
-                            item["link"],
-                            current_time,
-                            categories_json,
-                            item.get("summary", ""),  # Use get() with default
-                            item.get("full_content", ""),  # Use get() with default
-                            item["ranking"],
-                        ),
-                    )
-
-                    # Verify the insert
-                    if cursor.rowcount == 1:
-                        log.info(f"Successfully stored item {item_id} for {source_url}")
-                    else:
-                        log.warning(f"Insert appeared to fail for item {item_id}")
-
-                except sqlite3.Error as e:
-                    log.error(f"SQLite error storing item {item_id}: {e}")
-                except Exception as e:
-                    log.error(f"Unexpected error storing item {item_id}: {e}")
-
-            # Commit at the end of all inserts
-            try:
-                conn.commit()
-                log.info(f"Committed {len(items)} items to database")
-            except sqlite3.Error as e:
-                log.error(f"Error committing transaction: {e}")
+                            row["id"],
+                            row["source_url"],
+                            row["title"],
+                            row["link"],
+                            row["first_seen"],
+                            encoded_categories[row["id"]],
+                            row["summary"],
+                            row["full_content"],
+                            row["ranking"],
+                        )
+                        for row in stored_items
+                    ],
+                )
+        except sqlite3.Error as e:
+            log.error(f"SQLite error storing items for {source_url}: {e}")
+            return []
+
+        log.info(f"Committed {len(stored_items)} items for {source_url} to database")
+        return stored_items
 
     def get_stored_items(self, source_url: str) -> List[Dict]:
         """
@@ -314,8 +520,7 @@ class ParsedItemStorage:
          with its attributes and parsed categories.
         """
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.conn as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -331,7 +536,7 @@ class ParsedItemStorage:
             for row in cursor.fetchall():
                 item = dict(row)
                 # Parse categories from JSON
-                item["categories"] = json.loads(item["categories"])
+                item["categories"] = list(_decode_categories(item["categories"]))
                 items.append(item)
 
             return items
@@ -349,7 +554,7 @@ class ParsedItemStorage:
         :return: A list of dictionaries representing items not found in the database,
          meaning they are new based on the criteria checked.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
 
             new_items = []
@@ -372,49 +577,49 @@ class ParsedItemStorage:
 
     def get_items_by_category(self, category: str) -> List[Dict]:
         """
-        Fetches items from the database that belong to a specified category.
+        Fetches items from the database that belong to a specified category. The
+        match is done inside SQLite by expanding the JSON list of categories with
+        `json_each`, so only exact category names match.
 
         :param category: The category to filter items by.
         :return: A list of dictionaries, where each dictionary represents an item
           and contains its details, including the categories it belongs to.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.conn as conn:
             cursor = conn.cursor()
 
             cursor.execute(
                 """
                 SELECT * FROM items 
-                WHERE json_extract(categories, '$[*]') LIKE ? and removed = 0
+                WHERE EXISTS (
+                    SELECT 1 FROM json_each(items.categories) WHERE value = ?
+                ) AND removed = 0
                 ORDER BY first_seen DESC
             """,
-                (f"%{category}%",),
+                (category,),
             )
 
             items = []
             for row in cursor.fetchall():
                 item = dict(row)
-                item["categories"] = json.loads(item["categories"])
+                item["categories"] = list(_decode_categories(item["categories"]))
                 items.append(item)
 
             return items
 
     def mark_as_removed(self, item_id: str) -> None:
         """Mark an item as removed."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._write_transaction() as cursor:
             cursor.execute("UPDATE items SET removed = 1 WHERE id = ?", (item_id,))
 
     def update_note(self, item_id: str, note: str) -> None:
         """Update the note for an item."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._write_transaction() as cursor:
             cursor.execute("UPDATE items SET notes = ? WHERE id = ?", (note, item_id))
 
     def update_full_content(self, item_id: str, content: str) -> None:
         """Update the full content of an item."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._write_transaction() as cursor:
             cursor.execute(
                 "UPDATE items SET full_content = ? WHERE id = ?", (content, item_id)
             )
@@ -0,0 +1,114 @@
+import pytest
+
+from aisignal.core.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, window=60.0, cooldown=30.0, clock=clock)
+
+
+def test_circuit_opens_after_threshold(breaker):
+    for _ in range(2):
+        breaker.record_failure("example.com")
+    assert breaker.allow_request("example.com")
+
+    breaker.record_failure("example.com")
+
+    assert breaker.is_open("example.com")
+    assert not breaker.allow_request("example.com")
+    assert breaker.allow_request("other.com")
+
+
+def test_failures_outside_window_are_forgotten(breaker, clock):
+    for _ in range(2):
+        breaker.record_failure("example.com")
+
+    clock.now += 61
+    breaker.record_failure("example.com")
+
+    assert not breaker.is_open("example.com")
+
+
+def test_success_resets_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure("example.com")
+
+    breaker.record_success("example.com")
+    breaker.record_failure("example.com")
+
+    assert not breaker.is_open("example.com")
+
+
+def test_half_open_allows_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.com")
+
+    clock.now += 31
+
+    assert breaker.allow_request("example.com")
+    assert not breaker.allow_request("example.com")
+
+
+def test_failed_probe_keeps_circuit_open(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.com")
+    clock.now += 31
+    breaker.allow_request("example.com")
+
+    breaker.record_failure("example.com")
+
+    assert not breaker.allow_request("example.com")
+    clock.now += 31
+    assert breaker.allow_request("example.com")
+
+
+def test_successful_probe_closes_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.com")
+    clock.now += 31
+    breaker.allow_request("example.com")
+
+    breaker.record_success("example.com")
+
+    assert not breaker.is_open("example.com")
+    assert breaker.allow_request("example.com")
+    assert breaker.allow_request("example.com")
+
+
+def test_released_probe_allows_another_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.com")
+    clock.now += 31
+    breaker.allow_request("example.com")
+
+    breaker.release_probe("example.com")
+
+    assert breaker.is_open("example.com")
+    assert breaker.allow_request("example.com")
+
+
+def test_stale_failures_while_open_are_ignored(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.com")
+
+    # A request started before the circuit opened fails afterwards, with no
+    # probe in flight: it must not push the cooldown forward
+    clock.now += 20
+    breaker.record_failure("example.com")
+    clock.now += 11
+
+    assert breaker.allow_request("example.com")
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import sqlite3
+from unittest.mock import MagicMock, Mock, patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from aisignal.core.circuit_breaker import CircuitBreaker
+from aisignal.core.sync_exceptions import ContentFetchError
+from aisignal.services.content import ContentService
+from aisignal.services.storage import MarkdownSourceStorage, ParsedItemStorage
+
+
+@pytest_asyncio.fixture
+async def content_service():
+    markdown_storage = MarkdownSourceStorage(":memory:")
+    item_storage = ParsedItemStorage(":memory:")
+    service = ContentService(
+        jina_api_key="test-jina-key",
+        openai_api_key="test-openai-key",
+        categories=["AI"],
+        markdown_storage=markdown_storage,
+        item_storage=item_storage,
+        token_tracker=Mock(),
+        min_threshold=50.0,
+        max_threshold=80.0,
+    )
+    yield service
+    await service.close()
+    markdown_storage.close()
+    item_storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error, status, expected",
+    [
+        (aiohttp.ClientError("Network error"), None, "Network error"),
+        (None, 403, "JinaAI API error (403): Forbidden"),
+    ],
+)
+async def test_fetch_content_error_propagation(
+    content_service, error, status, expected
+):
+    mock_get = MagicMock(side_effect=error)
+    mock_get.return_value.__aenter__.return_value = Mock(
+        status=status, reason="Forbidden"
+    )
+
+    with patch("aiohttp.ClientSession.get", mock_get):
+        with pytest.raises(ContentFetchError, match=re.escape(expected)):
+            await content_service.fetch_content("https://example.com")
+
+
+@pytest.mark.asyncio
+async def test_fetch_content_opens_circuit_after_repeated_failures(content_service):
+    threshold = content_service.circuit_breaker.failure_threshold
+    with patch(
+        "aiohttp.ClientSession.get", side_effect=aiohttp.ClientError("Network error")
+    ) as mock_get:
+        for _ in range(threshold):
+            with pytest.raises(ContentFetchError, match="Network error"):
+                await content_service.fetch_content("https://example.com/blog")
+
+        with pytest.raises(ContentFetchError, match="too many recent failures"):
+            await content_service.fetch_content("https://example.com/news")
+
+    assert mock_get.call_count == threshold
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared_until_closed(content_service):
+    session = content_service._get_session()
+
+    assert content_service._get_session() is session
+
+    await content_service.close()
+
+    assert session.closed
+    new_session = content_service._get_session()
+    assert new_session is not session
+
+
+@pytest.mark.asyncio
+async def test_session_does_not_queue_requests_to_the_same_host(content_service):
+    session = content_service._get_session()
+
+    # Waiting for a pooled connection must not count as a connect timeout
+    assert session.connector.limit == 0
+    assert session.connector.limit_per_host == 0
+    assert session.timeout.connect is None
+    assert session.timeout.sock_connect == 5
+
+
+@pytest.mark.asyncio
+async def test_injected_session_is_used_and_left_open(content_service):
+    async with aiohttp.ClientSession() as session:
+        service = ContentService(
+            jina_api_key="test-jina-key",
+            openai_api_key="test-openai-key",
+            categories=["AI"],
+            markdown_storage=content_service.markdown_storage,
+            item_storage=content_service.item_storage,
+            token_tracker=Mock(),
+            min_threshold=50.0,
+            max_threshold=80.0,
+            session=session,
+        )
+
+        assert service._get_session() is session
+
+        await service.close()
+
+        assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_block_host(content_service):
+    content_service.circuit_breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    content_service.circuit_breaker.record_failure("example.com")
+
+    with patch("aiohttp.ClientSession.get", side_effect=asyncio.CancelledError):
+        with pytest.raises(asyncio.CancelledError):
+            await content_service.fetch_content("https://example.com")
+
+    assert content_service.circuit_breaker.allow_request("example.com")
+
+
+@pytest.mark.asyncio
+async def test_local_errors_do_not_open_circuit(content_service):
+    content_service.token_tracker.estimate_jina_tokens.return_value = 0
+    mock_get = MagicMock()
+    response = mock_get.return_value.__aenter__.return_value
+    response.status = 200
+    response.text.return_value = "# Title"
+
+    with patch("aiohttp.ClientSession.get", mock_get), patch.object(
+        content_service.markdown_storage,
+        "store_content",
+        side_effect=sqlite3.OperationalError("disk full"),
+    ):
+        for _ in range(content_service.circuit_breaker.failure_threshold):
+            with pytest.raises(ContentFetchError, match="disk full"):
+                await content_service.fetch_content("https://example.com")
+
+    assert not content_service.circuit_breaker.is_open("example.com")
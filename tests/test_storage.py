@@ -0,0 +1,353 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from aisignal.services.storage import (
+    BaseStorage,
+    MarkdownSourceStorage,
+    ParsedItemStorage,
+)
+
+
+# Tests that don't depend on on-disk behaviour use an in-memory database, which
+# lives as long as the storage connection and skips file creation and fsyncs
+@pytest.fixture
+def item_storage():
+    storage = ParsedItemStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def markdown_storage():
+    storage = MarkdownSourceStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def sample_items():
+    return [
+        {
+            "title": "First item",
+            "link": "https://example.com/1",
+            "categories": ["AI"],
+            "summary": "First summary",
+            "full_content": "",
+            "ranking": 70,
+        },
+        {
+            "title": "Second item",
+            "link": "https://example.com/2",
+            "categories": ["AI", "Programming"],
+            "summary": "Second summary",
+            "ranking": 55,
+        },
+    ]
+
+
+def test_store_items_returns_stored_rows(item_storage, sample_items):
+    stored = item_storage.store_items("https://example.com", sample_items)
+
+    assert [item["title"] for item in stored] == ["First item", "Second item"]
+    assert stored[1]["source_url"] == "https://example.com"
+    assert stored[1]["categories"] == ["AI", "Programming"]
+    assert stored[1]["full_content"] == ""
+    assert stored[0]["first_seen"] == stored[1]["first_seen"]
+
+
+def test_store_items_rows_match_stored_rows(item_storage, sample_items):
+    stored = item_storage.store_items("https://example.com", sample_items)
+    fetched = item_storage.get_stored_items("https://example.com")
+
+    def by_id(item):
+        return item["id"]
+
+    assert sorted(stored, key=by_id) == sorted(fetched, key=by_id)
+
+
+def test_store_items_skips_existing_items(item_storage, sample_items):
+    item_storage.store_items("https://example.com", sample_items[:1])
+
+    stored = item_storage.store_items("https://example.com", sample_items)
+
+    assert [item["title"] for item in stored] == ["Second item"]
+
+
+def test_storage_reuses_connection(item_storage, sample_items):
+    conn = item_storage.conn
+    item_storage.store_items("https://example.com", sample_items)
+
+    assert item_storage.conn is conn
+
+
+def test_close_reopens_lazily(tmp_path, sample_items):
+    storage = ParsedItemStorage(str(tmp_path / "storage.db"))
+    storage.store_items("https://example.com", sample_items[:1])
+    first_conn = storage.conn
+
+    storage.close()
+    stored = storage.store_items("https://example.com", sample_items)
+
+    assert storage.conn is not first_conn
+    assert [item["title"] for item in stored] == ["Second item"]
+    storage.close()
+
+
+def test_connection_uses_wal_journal(tmp_path):
+    storage = ParsedItemStorage(str(tmp_path / "storage.db"))
+
+    journal_mode = storage.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous = storage.conn.execute("PRAGMA synchronous").fetchone()[0]
+    busy_timeout = storage.conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    storage.close()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5000
+
+
+def test_store_items_deduplicates_within_batch(item_storage, sample_items):
+    stored = item_storage.store_items(
+        "https://example.com", [sample_items[0], dict(sample_items[0])]
+    )
+
+    assert len(stored) == 1
+    count = item_storage.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    assert count == 1
+
+
+def test_store_items_skips_invalid_items(item_storage, sample_items):
+    invalid_item = {"title": "No link"}
+
+    stored = item_storage.store_items(
+        "https://example.com", [invalid_item, sample_items[0]]
+    )
+
+    assert [item["title"] for item in stored] == ["First item"]
+
+
+def test_store_items_skips_unserializable_categories(item_storage, sample_items):
+    invalid_item = dict(sample_items[1], categories={"AI"})
+
+    stored = item_storage.store_items(
+        "https://example.com", [invalid_item, sample_items[0]]
+    )
+
+    assert [item["title"] for item in stored] == ["First item"]
+
+
+def test_store_and_get_content(markdown_storage):
+    markdown_storage.store_content("https://example.com", "# Title\n\nBody")
+
+    assert markdown_storage.get_stored_content("https://example.com") == (
+        "# Title\n\nBody"
+    )
+    assert not markdown_storage.conn.in_transaction
+
+
+def test_write_transaction_rolls_back_on_error(markdown_storage):
+    with pytest.raises(RuntimeError):
+        with markdown_storage._write_transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO sources VALUES (?, ?, ?, ?)",
+                ("https://example.com", "content", "hash", "2024-01-01"),
+            )
+            raise RuntimeError("boom")
+
+    assert markdown_storage.get_stored_content("https://example.com") is None
+    assert not markdown_storage.conn.in_transaction
+
+
+class FailingCommitConnection(sqlite3.Connection):
+    fail_next_commit = False
+
+    def commit(self):
+        if self.fail_next_commit:
+            self.fail_next_commit = False
+            raise sqlite3.OperationalError("disk I/O error")
+        super().commit()
+
+
+def test_write_transaction_rolls_back_on_commit_error(markdown_storage):
+    markdown_storage.close()
+    conn = sqlite3.connect(":memory:", factory=FailingCommitConnection)
+    conn.row_factory = sqlite3.Row
+    markdown_storage._conn = conn
+    markdown_storage.init_database()
+
+    conn.fail_next_commit = True
+    with pytest.raises(sqlite3.OperationalError):
+        markdown_storage.store_content("https://example.com", "lost")
+
+    assert not conn.in_transaction
+    markdown_storage.store_content("https://example.com", "kept")
+    assert markdown_storage.get_stored_content("https://example.com") == "kept"
+
+
+def test_update_full_content(item_storage, sample_items):
+    stored = item_storage.store_items("https://example.com", sample_items[:1])
+
+    item_storage.update_full_content(stored[0]["id"], "Full content")
+
+    row = item_storage.conn.execute(
+        "SELECT full_content FROM items WHERE id = ?", (stored[0]["id"],)
+    ).fetchone()
+    assert row[0] == "Full content"
+
+
+def test_corrupted_database_is_quarantined(tmp_path, sample_items):
+    db_path = tmp_path / "storage.db"
+    db_path.write_bytes(b"this is not a sqlite database" * 100)
+
+    storage = ParsedItemStorage(str(db_path))
+    stored = storage.store_items("https://example.com", sample_items)
+    storage.close()
+
+    assert len(stored) == 2
+    assert len(list(tmp_path.glob("storage.db.corrupt-*"))) == 1
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/fd").is_dir(), reason="needs /proc to list open files"
+)
+def test_quarantined_database_is_not_left_open(tmp_path):
+    db_path = tmp_path / "storage.db"
+    db_path.write_bytes(b"this is not a sqlite database" * 100)
+
+    storage = ParsedItemStorage(str(db_path))
+    open_files = set()
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            open_files.add(os.readlink(f"/proc/self/fd/{fd}"))
+        except FileNotFoundError:
+            # The descriptor used by listdir itself is gone by now
+            pass
+    storage.close()
+
+    assert not any(".corrupt-" in path for path in open_files)
+
+
+def test_schema_errors_do_not_quarantine_database(tmp_path):
+    db_path = tmp_path / "storage.db"
+    ParsedItemStorage(str(db_path)).close()
+
+    class BrokenStorage(ParsedItemStorage):
+        def init_database(self):
+            raise sqlite3.IntegrityError("bug in schema code")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        BrokenStorage(str(db_path))
+
+    assert db_path.exists()
+    assert list(tmp_path.glob("storage.db.corrupt-*")) == []
+
+
+def test_get_items_by_category(item_storage, sample_items):
+    item_storage.store_items("https://example.com", sample_items)
+
+    ai_items = item_storage.get_items_by_category("AI")
+    programming_items = item_storage.get_items_by_category("Programming")
+
+    assert {item["title"] for item in ai_items} == {"First item", "Second item"}
+    assert [item["title"] for item in programming_items] == ["Second item"]
+    assert programming_items[0]["categories"] == ["AI", "Programming"]
+    assert item_storage.get_items_by_category("A") == []
+
+
+def test_get_items_by_category_skips_removed(item_storage, sample_items):
+    stored = item_storage.store_items("https://example.com", sample_items)
+
+    item_storage.mark_as_removed(stored[1]["id"])
+
+    assert item_storage.get_items_by_category("Programming") == []
+
+
+def test_init_database_adds_missing_columns(tmp_path):
+    db_path = tmp_path / "storage.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE items (
+                id TEXT PRIMARY KEY,
+                source_url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                first_seen TIMESTAMP NOT NULL,
+                categories TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                full_content TEXT NOT NULL,
+                ranking INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+    conn.close()
+
+    storage = ParsedItemStorage(str(db_path))
+    columns = {row["name"] for row in storage.conn.execute("PRAGMA table_info(items)")}
+    storage.close()
+
+    assert {"removed", "notes"} <= columns
+
+
+def test_reopen_replaces_connection(tmp_path, sample_items):
+    storage = ParsedItemStorage(str(tmp_path / "storage.db"))
+    storage.store_items("https://example.com", sample_items)
+    first_conn = storage.conn
+
+    conn = storage.reopen()
+
+    assert conn is storage.conn
+    assert conn is not first_conn
+    assert len(storage.get_stored_items("https://example.com")) == 2
+    storage.close()
+
+
+def test_get_stored_items_uses_index_for_order(item_storage):
+    # Capture the statement get_stored_items actually runs, so the plan below
+    # follows any change to its query
+    statements = []
+    item_storage.conn.set_trace_callback(statements.append)
+    item_storage.get_stored_items("https://example.com")
+    item_storage.conn.set_trace_callback(None)
+    (query,) = [sql for sql in statements if "SELECT" in sql]
+
+    plan = item_storage.conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+    details = " ".join(row["detail"] for row in plan)
+
+    assert "idx_items_source_removed_first_seen" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_init_database_runs_in_one_transaction(tmp_path):
+    statements = []
+    storage = ParsedItemStorage(str(tmp_path / "storage.db"))
+    storage.conn.set_trace_callback(statements.append)
+    storage.init_database()
+    storage.close()
+
+    schema = [sql.strip() for sql in statements if "PRAGMA" not in sql]
+    assert schema[0] == "BEGIN;"
+    assert schema[-1] == "COMMIT;"
+
+
+def test_decoded_categories_are_independent_lists(item_storage, sample_items):
+    item_storage.store_items("https://example.com", sample_items)
+
+    first = item_storage.get_items_by_category("AI")
+    first[0]["categories"].append("Mutated")
+    second = item_storage.get_items_by_category("AI")
+
+    assert all("Mutated" not in item["categories"] for item in second)
+
+
+def test_base_storage_requires_init_database(tmp_path):
+    class IncompleteStorage(BaseStorage):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteStorage(str(tmp_path / "storage.db"))
+
+    assert not (tmp_path / "storage.db").exists()